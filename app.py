@@ -1,10 +1,10 @@
-import os
 import pandas as pd
 import streamlit as st
-from sqlalchemy import create_engine, text, event
-from sqlalchemy.engine import URL
-from dotenv import load_dotenv
 import base64
+import json
+
+import queries
+from db import ensure_indexes, fetch_df, fetch_many
 
 # ------- MY IMPORTS FOR VISUALIZATIONS -------
 import networkx as nx
@@ -15,65 +15,22 @@ import plotly.graph_objects as go
 
 
 st.set_page_config(page_title=" AUDIOPLANE", page_icon="./assets/img/audioplaneWindowIcon.png", layout="wide")
-load_dotenv()
-
-PGHOST = os.getenv("PGHOST", "localhost")
-PGPORT = os.getenv("PGPORT", "5432")
-PGDATABASE = os.getenv("PGDATABASE")
-PGUSER = os.getenv("PGUSER")
-PGPASSWORD = os.getenv("PGPASSWORD")
-PGSSLMODE = os.getenv("PGSSLMODE", "require")
-
-if not all([PGDATABASE, PGUSER, PGPASSWORD]):
-    st.error("Missing DB credentials. Please set PGDATABASE, PGUSER, and PGPASSWORD in your .env file.")
-    st.stop()
-
-def make_url() -> URL:
-    return URL.create(
-        "postgresql+psycopg2",
-        username=PGUSER,
-        password=PGPASSWORD,
-        host=PGHOST,
-        port=int(PGPORT),
-        database=PGDATABASE,
-        query={
-            "connect_timeout": "5",
-            "sslmode": PGSSLMODE
-        },
-    )
-
-@st.cache_resource
-def get_engine():
-    engine = create_engine(
-        make_url(),
-        pool_pre_ping=True,
-        pool_size=5,
-        max_overflow=0,
-        pool_timeout=5,
-        pool_recycle=1800,
-    )
 
-    @event.listens_for(engine, "connect")
-    def _set_statement_timeout(dbapi_connection, connection_record):
-        with dbapi_connection.cursor() as cur:
-            cur.execute("SET statement_timeout TO 8000")
-            cur.execute(f"SET search_path TO {PGUSER}, public")
+# Engine, credentials and the fetch helpers are shared with app_full_crud.py and live in db.py
+ensure_indexes()
 
-    return engine
-
-engine = get_engine()
-
-def fetch_df(sql: str, params: dict | None = None) -> pd.DataFrame:
-    try:
-        with engine.connect() as conn:
-            return pd.read_sql(text(sql), conn, params=params or {})
-    except Exception as e:
-        st.error(f"DB error: {e}")
-        return pd.DataFrame()
+# The *_PAGE queries carry COUNT(*) OVER () so the real table size comes back with the page of rows
+# in the same round-trip; this pulls it off before the frame is displayed.
+def split_total(df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    if df.empty:
+        return df, 0
+    return df.drop(columns="total_count"), int(df["total_count"].iloc[0])
 
 # This was such a pain to figure out because my logo I made is an SVG file so i had to convert it to base64 in order to get it to work properly and hover like I wanted.
 #I had no trouble when i used st.image with the svg but getting the hover effect I needed to do it this way but it was fun learning this!
-def get_base64_image(image_path):
+# Cached so the logo is only read + encoded once instead of on every rerun
+@st.cache_data(show_spinner=False)
+def get_base64_image(image_path: str) -> str:
     with open(image_path, "rb") as img_file:
         return base64.b64encode(img_file.read()).decode()
 # --- File Path to my Logo
@@ -205,144 +162,121 @@ tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
 # ---------------- Tab 1: Users ----------------
 with tab1:
     st.subheader("👤 Users")
-    sql = "SELECT * FROM User_table ORDER BY userID LIMIT :lim"
-    df = fetch_df(sql, {"lim": int(row_limit)})
+    df, total = split_total(fetch_df(queries.USERS_PAGE, {"lim": row_limit}))
     st.dataframe(df, use_container_width=True)
 
     if not df.empty:
-        st.metric("Total Users", len(df))
+        st.metric("Total Users", total)
 
 # ---------------- Tab 2: Songs ----------------
 with tab2:
     st.subheader("🎵 Songs")
 
+    dfs = fetch_many({
+        "all": (queries.SONGS_PAGE, {"lim": row_limit}),
+        "join": (queries.SONGS_WITH_ARTIST, {"lim": row_limit}),
+    })
+    df, total = split_total(dfs["all"])
+    df2 = dfs["join"]
+
     col1, col2 = st.columns(2)
     # Displays all of the songs currently within my database
     with col1:
         st.markdown("#### All Songs")
-        sql = "SELECT * FROM Song ORDER BY song_id LIMIT :lim"
-        df = fetch_df(sql, {"lim": int(row_limit)})
         st.dataframe(df, use_container_width=True)
     # Display Songs along with the artist who created them
     with col2:
         st.markdown("#### Songs and Who Created Them")
-        sql = """
-            SELECT s.song_id, s.songName, s.dayReleased, a.artist_name
-            FROM Song s
-            JOIN Produces p ON s.song_id = p.song_id
-            JOIN Artist a ON p.artistID = a.artistID
-            ORDER BY s.song_id
-            LIMIT :lim
-        """
-        df2 = fetch_df(sql, {"lim": int(row_limit)})
         st.dataframe(df2, use_container_width=True)
 
     if not df.empty:
-        st.metric("Total Songs", len(df))
+        st.metric("Total Songs", total)
 
 # ---------------- Tab 3: Albums ----------------
 with tab3:
     st.subheader("💿 Albums")
 
+    dfs = fetch_many({
+        "all": (queries.ALBUMS_PAGE, {"lim": row_limit}),
+        "join": (queries.ALBUMS_WITH_ARTIST, {"lim": row_limit}),
+    })
+    df, total = split_total(dfs["all"])
+    df2 = dfs["join"]
+
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown("#### All Albums")
-        sql = "SELECT * FROM Album ORDER BY albumID LIMIT :lim"
-        df = fetch_df(sql, {"lim": int(row_limit)})
         st.dataframe(df, use_container_width=True)
 
     with col2:
         st.markdown("#### Albums with Artists")
-        sql = """
-            SELECT al.albumID, al.album_name, al.release_date, ar.artist_name
-            FROM Album al
-            JOIN Records r ON al.albumID = r.albumID
-            JOIN Artist ar ON r.artistID = ar.artistID
-            ORDER BY al.release_date DESC
-            LIMIT :lim
-        """
-        df2 = fetch_df(sql, {"lim": int(row_limit)})
         st.dataframe(df2, use_container_width=True)
 
     if not df.empty:
-        st.metric("Total Albums", len(df))
+        st.metric("Total Albums", total)
 
 # ---------------- Tab 4: Artists ----------------
 with tab4:
     st.subheader("🎤 Artists")
-    sql = "SELECT * FROM Artist ORDER BY artistID LIMIT :lim"
-    df = fetch_df(sql, {"lim": int(row_limit)})
+    df, total = split_total(fetch_df(queries.ARTISTS_PAGE, {"lim": row_limit}))
     st.dataframe(df, use_container_width=True)
 
     if not df.empty:
-        st.metric("Total Artists", len(df))
+        st.metric("Total Artists", total)
 
         st.markdown("#### Artist Song Counts")
-        sql2 = """
-            SELECT a.artist_name, COUNT(p.song_id) as song_count
-            FROM Artist a
-            LEFT JOIN Produces p ON a.artistID = p.artistID
-            GROUP BY a.artistID, a.artist_name
-            ORDER BY song_count DESC
-            LIMIT :lim
-        """
-        df2 = fetch_df(sql2, {"lim": int(row_limit)})
+        df2 = fetch_df(queries.ARTIST_SONG_COUNTS, {"lim": row_limit})
         st.dataframe(df2, use_container_width=True)
 
+# Picking a playlist only reruns this section instead of the whole page
+@st.fragment
+def playlist_contents():
+    st.markdown("#### Playlist Contents")
+    playlists = fetch_df(queries.PLAYLIST_NAMES)
+
+    if not playlists.empty:
+        # id -> name, so format_func is a dict lookup per option instead of filtering the frame each time
+        playlist_names = dict(zip(playlists['playlistid'], playlists['playlist_name']))
+        selected_playlist = st.selectbox(
+            "Select a playlist to view songs:",
+            options=list(playlist_names),
+            format_func=playlist_names.get
+        )
+
+        playlist_songs = fetch_df(queries.PLAYLIST_SONGS, {"pid": int(selected_playlist)})
+        st.dataframe(playlist_songs, use_container_width=True)
+
 # ---------------- Tab 5: Playlists ----------------
 with tab5:
     st.subheader("📋 Playlists")
 
+    dfs = fetch_many({
+        "all": (queries.PLAYLISTS_PAGE, {"lim": row_limit}),
+        "join": (queries.PLAYLISTS_WITH_CREATOR, {"lim": row_limit}),
+    })
+    df, total = split_total(dfs["all"])
+    df2 = dfs["join"]
+
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown("#### All Playlists")
-        sql = "SELECT * FROM Playlist ORDER BY playlistID LIMIT :lim"
-        df = fetch_df(sql, {"lim": int(row_limit)})
         st.dataframe(df, use_container_width=True)
 
     with col2:
         st.markdown("#### Playlists with Creators")
-        sql = """
-            SELECT p.playlistID, p.playlist_name, p.num_songs, u.userName as creator
-            FROM Playlist p
-            JOIN Creates c ON p.playlistID = c.playlistID
-            JOIN User_table u ON c.userID = u.userID
-            ORDER BY p.playlistID
-            LIMIT :lim
-        """
-        df2 = fetch_df(sql, {"lim": int(row_limit)})
         st.dataframe(df2, use_container_width=True)
 
     if not df.empty:
-        st.metric("Total Playlists", len(df))
-
-    st.markdown("#### Playlist Contents")
-    playlists_sql = "SELECT playlistID, playlist_name FROM Playlist ORDER BY playlistID"
-    playlists = fetch_df(playlists_sql)
+        st.metric("Total Playlists", total)
 
-    if not playlists.empty:
-        selected_playlist = st.selectbox(
-            "Select a playlist to view songs:",
-            options=playlists['playlistid'].tolist(),
-            format_func=lambda x: playlists[playlists['playlistid']==x]['playlist_name'].iloc[0]
-        )
-
-        sql3 = """
-            SELECT s.songName, a.artist_name, sv.position
-            FROM Saves sv
-            JOIN Song s ON sv.song_id = s.song_id
-            JOIN Produces p ON s.song_id = p.song_id
-            JOIN Artist a ON p.artistID = a.artistID
-            WHERE sv.playlistID = :pid
-            ORDER BY sv.position
-        """
-        playlist_songs = fetch_df(sql3, {"pid": int(selected_playlist)})
-        st.dataframe(playlist_songs, use_container_width=True)
+    playlist_contents()
 
 # ---------------- Tab 6: Relationship Views ----------------
-with tab6:
+# Switching views only reruns this tab
+@st.fragment
+def relationship_views(limit: int):
     st.subheader("🔗 Relationship Views")
 
     view_choice = st.radio(
@@ -351,69 +285,24 @@ with tab6:
     )
 
     if view_choice == "User Likes":
-        sql = """
-            SELECT u.userName, s.songName, a.artist_name, l.liked_date
-            FROM Likes l
-            JOIN User_table u ON l.userID = u.userID
-            JOIN Song s ON l.song_id = s.song_id
-            JOIN Produces p ON s.song_id = p.song_id
-            JOIN Artist a ON p.artistID = a.artistID
-            ORDER BY l.liked_date DESC
-            LIMIT :lim
-        """
-        st.dataframe(fetch_df(sql, {"lim": int(row_limit)}), use_container_width=True)
+        st.dataframe(fetch_df(queries.USER_LIKES, {"lim": limit}), use_container_width=True)
 
     elif view_choice == "Album Tracks":
-        sql = """
-            SELECT al.album_name, s.songName, c.track_number, ar.artist_name
-            FROM Contains c
-            JOIN Album al ON c.albumID = al.albumID
-            JOIN Song s ON c.song_id = s.song_id
-            JOIN Records r ON al.albumID = r.albumID
-            JOIN Artist ar ON r.artistID = ar.artistID
-            ORDER BY al.album_name, c.track_number
-            LIMIT :lim
-        """
-        st.dataframe(fetch_df(sql, {"lim": int(row_limit)}), use_container_width=True)
+        st.dataframe(fetch_df(queries.ALBUM_TRACKS, {"lim": limit}), use_container_width=True)
 
     elif view_choice == "Most Liked Songs":
-        sql = """
-            SELECT s.songName, a.artist_name, COUNT(l.userID) as like_count
-            FROM Song s
-            JOIN Produces p ON s.song_id = p.song_id
-            JOIN Artist a ON p.artistID = a.artistID
-            LEFT JOIN Likes l ON s.song_id = l.song_id
-            GROUP BY s.song_id, s.songName, a.artist_name
-            ORDER BY like_count DESC
-            LIMIT :lim
-        """
-        st.dataframe(fetch_df(sql, {"lim": int(row_limit)}), use_container_width=True)
+        st.dataframe(fetch_df(queries.MOST_LIKED_SONGS, {"lim": limit}), use_container_width=True)
 
     elif view_choice == "User Activity":
-        sql = """
-            SELECT 
-                u.userName,
-                COUNT(DISTINCT l.song_id) as songs_liked,
-                COUNT(DISTINCT c.playlistID) as playlists_created
-            FROM User_table u
-            LEFT JOIN Likes l ON u.userID = l.userID
-            LEFT JOIN Creates c ON u.userID = c.userID
-            GROUP BY u.userID, u.userName
-            ORDER BY songs_liked DESC
-            LIMIT :lim
-        """
-        st.dataframe(fetch_df(sql, {"lim": int(row_limit)}), use_container_width=True)
-
+        st.dataframe(fetch_df(queries.USER_ACTIVITY, {"lim": limit}), use_container_width=True)
 
-st.header("Some Cool Visualizations You Should Check Out!")
-
-# -------------------- Network Graph --------------------
+with tab6:
+    relationship_views(row_limit)
 
-st.markdown("### User-Song Network")
-st.caption("Interactive visualization showing which users like which songs. Hover over songs to see the artist!")
 
-# Legend
-st.markdown("""
+# ==================== Visualizations ====================
+# Legend for the network graph (kept up here so the markdown isn't indented into a code block)
+NETWORK_LEGEND_HTML = """
 <div style="background-color: #2d2d2d; padding: 15px; border-radius: 10px; margin-bottom: 20px;">
     <h4 style="margin-top: 0;">Legend:</h4>
     <div style="display: flex; gap: 30px; flex-wrap: wrap;">
@@ -431,124 +320,128 @@ st.markdown("""
         </div>
     </div>
 </div>
-""", unsafe_allow_html=True)
-
-sql = """
-    SELECT u.userName, s.songName, a.artist_name
-    FROM Likes l
-    JOIN User_table u ON l.userID = u.userID
-    JOIN Song s ON l.song_id = s.song_id
-    JOIN Produces p ON s.song_id = p.song_id
-    JOIN Artist a ON p.artistID = a.artistID
-    LIMIT 500
 """
-df_rel = fetch_df(sql)
 
-if not df_rel.empty:
+NETWORK_STABILIZE_MAX_NODES = 100
+
+# Building the graph + pyvis physics is the slowest thing on this page, so the finished HTML is cached
+# and only rebuilt when the (user, song, artist) rows actually change (the cache hashes the frame's contents).
+# Each entry is a few hundred KB of HTML, so only the most recent few edge sets are kept.
+@st.cache_data(max_entries=4, show_spinner=False)
+def build_network_html(df_rel: pd.DataFrame) -> tuple[str, int, int]:
     G = nx.Graph()
 
-    # Add nodes with different colors
-    for _, row in df_rel.iterrows():
-        user = row['username']
-        song = row['songname']
-        artist = row['artist_name']
-
-        # Add user nodes 
-        if not G.has_node(f"{user}"):
-            G.add_node(f"{user}", color="#0CECA1", size=25, title=f"User: {user}")
-        
-        # Add song nodes with artist in hover 
-        song_label = f"{song}"
-        if not G.has_node(song_label):
-            G.add_node(song_label, color="#8980DF", size=20, title=f"Song: {song}\nArtist: {artist}")
-        
-        # Connect user to song
-        G.add_edge(f"{user}", song_label)
+    # Add user nodes 
+    users = df_rel["username"].unique()
+    G.add_nodes_from((u, {"color": "#0CECA1", "size": 25, "title": f"User: {u}"}) for u in users)
+
+    # Add song nodes with artist in hover (first artist seen wins, same as before)
+    songs = df_rel[["songname", "artist_name"]].drop_duplicates(subset="songname")
+    G.add_nodes_from(
+        (song, {"color": "#8980DF", "size": 20, "title": f"Song: {song}\nArtist: {artist}"})
+        for song, artist in songs.itertuples(index=False)
+    )
+
+    # Connect users to songs
+    G.add_edges_from(zip(df_rel["username"], df_rel["songname"]))
 
     # Create network visualization
     net = Network(height="700px", width="100%", bgcolor="#1a1a1a", font_color="white")
     net.from_nx(G)
     
-    # Physics settings for better layout
-    net.set_options("""
-    {
-      "physics": {
-        "forceAtlas2Based": {
-          "gravitationalConstant": -50,
-          "centralGravity": 0.01,
-          "springLength": 150,
-          "springConstant": 0.08
-        },
-        "maxVelocity": 50,
-        "solver": "forceAtlas2Based",
-        "timestep": 0.35,
-        "stabilization": {"iterations": 150}
-      }
-    }
-    """)
-    
-    net.save_graph("network.html")
+    # Physics settings for better layout. The 150 stabilization iterations run in the browser before anything
+    # paints, which gets really slow once the graph is big, so past NETWORK_STABILIZE_MAX_NODES the graph draws
+    # right away and settles while you watch.
+    stabilization = {"iterations": 150} if len(G) < NETWORK_STABILIZE_MAX_NODES else {"enabled": False}
+    net.set_options(json.dumps({
+        "physics": {
+            "forceAtlas2Based": {
+                "gravitationalConstant": -50,
+                "centralGravity": 0.01,
+                "springLength": 150,
+                "springConstant": 0.08
+            },
+            "maxVelocity": 50,
+            "solver": "forceAtlas2Based",
+            "timestep": 0.35,
+            "stabilization": stabilization
+        }
+    }))
     
-    st.components.v1.html(open("network.html").read(), height=720)
-    
-    # Additional info below the graph
-    st.info(f"📊 Showing {len(G.nodes())} nodes and {len(G.edges())} connections")
-else:
-    st.info("No relationship data found.")
-
-# A little Pie Chart action to visualize Top 5 most liked songs within Audioplane
-st.markdown("### Top 5 Most Liked Songs")
-
-sql = """
-    SELECT s.songName, COUNT(l.userID) AS like_count
-    FROM Song s
-    LEFT JOIN Likes l ON s.song_id = l.song_id
-    GROUP BY s.songName
-    ORDER BY like_count DESC
-    LIMIT 5
-"""
-df_popular = fetch_df(sql)
+    return net.generate_html(), G.number_of_nodes(), G.number_of_edges()
 
-if not df_popular.empty:
-    fig = px.pie(
+# px.pie does a fair bit of work on the frame, so the figure object itself is kept and reused while the
+# top 5 doesn't change (st.plotly_chart only reads it)
+@st.cache_resource(max_entries=4, show_spinner=False)
+def build_pie_figure(df_popular: pd.DataFrame) -> go.Figure:
+    return px.pie(
         df_popular,
         names="songname",
         values="like_count",
-        title="Top 10 Song by Popularity (Likes)"
+        title="Top 5 Songs by Popularity (Likes)"
     )
-    st.plotly_chart(fig, use_container_width=True)
-else:
-    st.info("No data available for popularity chart.")
 
-
-# Just taking the average of songs per playlist for a cool looking visual (In My Opinion)
-st.markdown("### Average Songs Per Playlist")
-
-sql = """
-    SELECT AVG(song_count) AS avg_songs
-    FROM (
-        SELECT playlistID, COUNT(song_id) AS song_count
-        FROM Saves
-        GROUP BY playlistID
-    ) t
-"""
-df_avg = fetch_df(sql)
-
-if not df_avg.empty:
-    avg_val = df_avg["avg_songs"].iloc[0] or 0
-
-    st.metric("Average Songs Per Playlist", f"{avg_val:.2f}")
-
-    fig = go.Figure(go.Indicator(
+# A single Indicator is quicker to build fresh than to fetch from any cache
+def build_gauge_figure(avg_val: float) -> go.Figure:
+    return go.Figure(go.Indicator(
         mode="gauge+number",
         value=avg_val,
         title={"text": "Avg Songs per Playlist"},
         gauge={"axis": {"range": [0, max(10, avg_val * 2)]}}
     ))
 
-    st.plotly_chart(fig, use_container_width=True)
-else:
-    st.info("No playlist activity found.")
+# The visualizations are their own fragment. Together with the playlist picker and relationship views above
+# (also fragments), using those widgets no longer reruns the network graph and the charts.
+@st.fragment
+def render_visualizations():
+    st.header("Some Cool Visualizations You Should Check Out!")
+
+    # -------------------- Network Graph --------------------
+
+    st.markdown("### User-Song Network")
+    st.caption("Interactive visualization showing which users like which songs. Hover over songs to see the artist!")
+
+    # Legend
+    st.markdown(NETWORK_LEGEND_HTML, unsafe_allow_html=True)
+
+    df_rel = fetch_df(queries.NETWORK_EDGES)
+
+    if not df_rel.empty:
+        network_html, n_nodes, n_edges = build_network_html(df_rel[["username", "songname", "artist_name"]])
+    
+        st.components.v1.html(network_html, height=720)
+    
+        # Additional info below the graph
+        st.info(f"📊 Showing {n_nodes} nodes and {n_edges} connections")
+    else:
+        st.info("No relationship data found.")
+
+    # A little Pie Chart action to visualize Top 5 most liked songs within Audioplane
+    st.markdown("### Top 5 Most Liked Songs")
+
+    df_popular = fetch_df(queries.TOP_LIKED_SONGS)
+
+    if not df_popular.empty:
+        st.plotly_chart(build_pie_figure(df_popular), use_container_width=True)
+    else:
+        st.info("No data available for popularity chart.")
+
+    # Just taking the average of songs per playlist for a cool looking visual (In My Opinion)
+    st.markdown("### Average Songs Per Playlist")
+
+    df_avg = fetch_df(queries.AVG_SONGS_PER_PLAYLIST)
+
+    if not df_avg.empty:
+        # AVG comes back as an Arrow decimal (or NA when Saves is empty), so normalize it to a plain float
+        avg_val = float(df_avg["avg_songs"].fillna(0).iloc[0])
+
+        st.metric("Average Songs Per Playlist", f"{avg_val:.2f}")
+
+        st.plotly_chart(build_gauge_figure(avg_val), use_container_width=True)
+    else:
+        st.info("No playlist activity found.")
+
+render_visualizations()
 
 # Footer
 st.markdown("---")
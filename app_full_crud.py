@@ -1,163 +1,330 @@
-import os
+import functools
+from dataclasses import dataclass
+from typing import Any, Callable
+import numpy as np
 import pandas as pd
 import streamlit as st
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv
+from streamlit.errors import StreamlitAPIException
+
+import queries
+from db import execute_many_returning, execute_returning, fetch_df_uncached, format_choices
 
 # --- Config & env ---
+# Credentials, the engine and the shared fetch helpers live in db.py (same ones app.py uses)
 st.set_page_config(page_title="🎵 Music DB CRUD", page_icon="🎵", layout="wide")
-load_dotenv()
-
-PGHOST = os.getenv("PGHOST", "localhost")
-PGPORT = os.getenv("PGPORT", "5432")
-PGDATABASE = os.getenv("PGDATABASE")
-PGUSER = os.getenv("PGUSER")
-PGPASSWORD = os.getenv("PGPASSWORD")
-
-if not all([PGDATABASE, PGUSER, PGPASSWORD]):
-    st.error("Missing DB credentials. Please set PGDATABASE, PGUSER, and PGPASSWORD in your .env file.")
-    st.stop()
-
-from sqlalchemy.engine import URL
-from sqlalchemy import event
-
-def make_url() -> URL:
-    return URL.create(
-        "postgresql+psycopg2",
-        username=PGUSER,
-        password=PGPASSWORD,
-        host=PGHOST,
-        port=int(PGPORT),
-        database=PGDATABASE,
-        query={
-            "connect_timeout": "5",
-            "sslmode": "require"
-        },
-    )
-
-engine = create_engine(
-    make_url(),
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=0,
-    pool_timeout=5,
-    pool_recycle=1800,
-)
-
-@event.listens_for(engine, "connect")
-def _set_search_path(dbapi_connection, connection_record):
-    with dbapi_connection.cursor() as cur:
-        cur.execute("SET statement_timeout TO 8000")
-        cur.execute(f"SET search_path TO {PGUSER}, public")
 
 # --- Session flash ---
 st.session_state.setdefault("just_inserted", None)
 st.session_state.setdefault("just_updated", None)
 st.session_state.setdefault("just_deleted", None)
+st.session_state.setdefault("just_bulk_inserted", None)
+
+FLASH_MSGS = (
+    ("just_inserted", "✅", "Inserted"),
+    ("just_updated", "✏️", "Updated"),
+    ("just_deleted", "🗑️", "Deleted"),
+)
+
+# Reruns just the current tab after a write. If the click got handled during a full-app run instead
+# (e.g. it coalesced with a sidebar change), scope="fragment" raises even though the write already committed,
+# so fall back to a normal rerun there.
+def rerun_tab():
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+# Shows (and clears) any pending insert/update/delete message for this tab's entity
+def render_flashes(entity: str, id_field: str, name_field: str):
+    for key, icon, msg in FLASH_MSGS:
+        flash = st.session_state.get(key)
+        if flash and flash[0] == entity:
+            rec = flash[1]
+            st.success(f"{icon} {msg} {entity}: {rec[name_field]} (ID {rec[id_field]})")
+            st.session_state[key] = None
 
 st.title("🎵 Night Hawk's Music Database - Full CRUD")
 st.caption("Create, Read, Update, Delete operations for your music database")
 
 # --- Helpers ---
-def fetch_df(sql: str, params: dict | None = None) -> pd.DataFrame:
-    try:
-        with engine.connect() as conn:
-            return pd.read_sql(text(sql), conn, params=params or {})
-    except Exception as e:
-        st.error(f"Query failed: {e}")
-        return pd.DataFrame()
-
+# Turns a failed read into an inline error + empty frame. It sits outside st.cache_data so the exception
+# propagates through the cache first: failed queries never get cached.
+def query_guard(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            st.error(f"DB error: {e}")
+            return pd.DataFrame()
+    wrapper.clear = fn.clear
+    return wrapper
+
+# Lookup tables get re-read on every keystroke/selectbox change otherwise. Each one is cached for a minute
+# and cleared by its own insert/update/delete helper below.
+@query_guard
+@st.cache_data(ttl=60, show_spinner=False)
 def fetch_users() -> pd.DataFrame:
-    return fetch_df("SELECT userID, userName FROM User_table ORDER BY userID")
+    return fetch_df_uncached(queries.CRUD_USERS)
 
+@query_guard
+@st.cache_data(ttl=60, show_spinner=False)
 def fetch_artists() -> pd.DataFrame:
-    return fetch_df("SELECT artistID, artist_name, artist_location FROM Artist ORDER BY artistID")
+    return fetch_df_uncached(queries.CRUD_ARTISTS)
 
+# Albums are read-only in this app, so they're also pickled to disk and survive app restarts.
+# Streamlit doesn't support a TTL on persisted caches, so the Albums tab has a refresh button instead.
+@query_guard
+@st.cache_data(persist="disk", show_spinner=False)
 def fetch_albums() -> pd.DataFrame:
-    return fetch_df("SELECT albumID, album_name, release_date FROM Album ORDER BY albumID")
+    return fetch_df_uncached(queries.CRUD_ALBUMS)
 
+# Keyed on the sidebar row limit, so each limit gets its own cached page
+@query_guard
+@st.cache_data(ttl=60, show_spinner=False)
 def fetch_songs(limit: int) -> pd.DataFrame:
-    sql = 'SELECT song_id, songName, dayReleased FROM Song ORDER BY song_id LIMIT :lim'
-    return fetch_df(sql, {"lim": int(limit)})
+    return fetch_df_uncached(queries.CRUD_SONGS, {"lim": limit})
 
+@query_guard
+@st.cache_data(ttl=60, show_spinner=False)
 def fetch_playlists() -> pd.DataFrame:
-    return fetch_df("SELECT playlistID, playlist_name, num_songs FROM Playlist ORDER BY playlistID")
+    return fetch_df_uncached(queries.CRUD_PLAYLISTS)
 
 # --- SONG CRUD ---
 def insert_song(name: str, date_released):
-    sql = 'INSERT INTO Song(songName, dayReleased) VALUES (:n, :d) RETURNING song_id, songName, dayReleased'
-    with engine.begin() as conn:
-        df = pd.read_sql(text(sql), conn, params={"n": name, "d": date_released})
-    return df.iloc[0].to_dict() if not df.empty else None
+    rec = execute_returning(queries.INSERT_SONG, {"n": name, "d": date_released})
+    fetch_songs.clear()
+    return rec
+
+# rows are dicts keyed on songname / dayreleased (the insert's column names)
+def bulk_insert_songs(rows: list[dict]) -> list[dict]:
+    recs = execute_many_returning(queries.BULK_INSERT_SONGS, rows)
+    fetch_songs.clear()
+    return recs
 
 def update_song(sid: int, name: str, date_released):
-    sql = 'UPDATE Song SET songName = :n, dayReleased = :d WHERE song_id = :sid RETURNING song_id, songName, dayReleased'
-    with engine.begin() as conn:
-        df = pd.read_sql(text(sql), conn, params={"sid": int(sid), "n": name, "d": date_released})
-    return df.iloc[0].to_dict() if not df.empty else None
+    rec = execute_returning(queries.UPDATE_SONG, {"sid": int(sid), "n": name, "d": date_released})
+    fetch_songs.clear()
+    return rec
 
 def delete_song(sid: int):
-    sql = 'DELETE FROM Song WHERE song_id = :sid RETURNING song_id, songName, dayReleased'
-    with engine.begin() as conn:
-        df = pd.read_sql(text(sql), conn, params={"sid": int(sid)})
-    return df.iloc[0].to_dict() if not df.empty else None
+    rec = execute_returning(queries.DELETE_SONG, {"sid": int(sid)})
+    fetch_songs.clear()
+    return rec
 
 # --- ARTIST CRUD ---
 def insert_artist(name: str, location: str | None):
-    sql = 'INSERT INTO Artist(artist_name, artist_location) VALUES (:n, :l) RETURNING artistID, artist_name, artist_location'
-    with engine.begin() as conn:
-        df = pd.read_sql(text(sql), conn, params={"n": name, "l": location})
-    return df.iloc[0].to_dict() if not df.empty else None
+    rec = execute_returning(queries.INSERT_ARTIST, {"n": name, "l": location})
+    fetch_artists.clear()
+    return rec
 
 def update_artist(aid: int, name: str, location: str | None):
-    sql = 'UPDATE Artist SET artist_name = :n, artist_location = :l WHERE artistID = :aid RETURNING artistID, artist_name, artist_location'
-    with engine.begin() as conn:
-        df = pd.read_sql(text(sql), conn, params={"aid": int(aid), "n": name, "l": location})
-    return df.iloc[0].to_dict() if not df.empty else None
+    rec = execute_returning(queries.UPDATE_ARTIST, {"aid": int(aid), "n": name, "l": location})
+    fetch_artists.clear()
+    return rec
 
 def delete_artist(aid: int):
-    sql = 'DELETE FROM Artist WHERE artistID = :aid RETURNING artistID, artist_name, artist_location'
-    with engine.begin() as conn:
-        df = pd.read_sql(text(sql), conn, params={"aid": int(aid)})
-    return df.iloc[0].to_dict() if not df.empty else None
+    rec = execute_returning(queries.DELETE_ARTIST, {"aid": int(aid)})
+    fetch_artists.clear()
+    return rec
 
 # --- USER CRUD ---
 def insert_user(username: str):
-    sql = 'INSERT INTO User_table(userName) VALUES (:n) RETURNING userID, userName'
-    with engine.begin() as conn:
-        df = pd.read_sql(text(sql), conn, params={"n": username})
-    return df.iloc[0].to_dict() if not df.empty else None
+    rec = execute_returning(queries.INSERT_USER, {"n": username})
+    fetch_users.clear()
+    return rec
 
 def update_user(uid: int, username: str):
-    sql = 'UPDATE User_table SET userName = :n WHERE userID = :uid RETURNING userID, userName'
-    with engine.begin() as conn:
-        df = pd.read_sql(text(sql), conn, params={"uid": int(uid), "n": username})
-    return df.iloc[0].to_dict() if not df.empty else None
+    rec = execute_returning(queries.UPDATE_USER, {"uid": int(uid), "n": username})
+    fetch_users.clear()
+    return rec
 
 def delete_user(uid: int):
-    sql = 'DELETE FROM User_table WHERE userID = :uid RETURNING userID, userName'
-    with engine.begin() as conn:
-        df = pd.read_sql(text(sql), conn, params={"uid": int(uid)})
-    return df.iloc[0].to_dict() if not df.empty else None
+    rec = execute_returning(queries.DELETE_USER, {"uid": int(uid)})
+    fetch_users.clear()
+    return rec
 
 # --- PLAYLIST CRUD ---
 def insert_playlist(name: str, num_songs: int):
-    sql = 'INSERT INTO Playlist(playlist_name, num_songs) VALUES (:n, :ns) RETURNING playlistID, playlist_name, num_songs'
-    with engine.begin() as conn:
-        df = pd.read_sql(text(sql), conn, params={"n": name, "ns": num_songs})
-    return df.iloc[0].to_dict() if not df.empty else None
+    rec = execute_returning(queries.INSERT_PLAYLIST, {"n": name, "ns": num_songs})
+    fetch_playlists.clear()
+    return rec
 
 def update_playlist(pid: int, name: str, num_songs: int):
-    sql = 'UPDATE Playlist SET playlist_name = :n, num_songs = :ns WHERE playlistID = :pid RETURNING playlistID, playlist_name, num_songs'
-    with engine.begin() as conn:
-        df = pd.read_sql(text(sql), conn, params={"pid": int(pid), "n": name, "ns": num_songs})
-    return df.iloc[0].to_dict() if not df.empty else None
+    rec = execute_returning(queries.UPDATE_PLAYLIST, {"pid": int(pid), "n": name, "ns": num_songs})
+    fetch_playlists.clear()
+    return rec
 
 def delete_playlist(pid: int):
-    sql = 'DELETE FROM Playlist WHERE playlistID = :pid RETURNING playlistID, playlist_name, num_songs'
-    with engine.begin() as conn:
-        df = pd.read_sql(text(sql), conn, params={"pid": int(pid)})
-    return df.iloc[0].to_dict() if not df.empty else None
+    rec = execute_returning(queries.DELETE_PLAYLIST, {"pid": int(pid)})
+    fetch_playlists.clear()
+    return rec
+
+# --- Shared CRUD UI ---
+# The songs and playlists tabs have the same insert/update/delete layout: a name plus one extra field.
+# Each one is described by an EntitySpec and rendered by crud_ui.
+@dataclass(frozen=True)
+class EntitySpec:
+    entity: str                                  # "song": flash tag and widget-key prefix
+    label: str                                   # "Song"
+    fetch: Callable[..., pd.DataFrame]
+    insert: Callable[[str, Any], dict | None]    # (name, extra) -> RETURNING row
+    update: Callable[[int, str, Any], dict | None]
+    delete: Callable[[int], dict | None]
+    id_field: str
+    name_field: str
+    name_placeholder: str
+    extra_label: str
+    extra_field: str
+    extra_input: Callable[..., Any]              # (label, current=None) -> widget value
+    after_insert: Callable[[], None] | None = None
+
+# The insert form calls these with just the label; the update form passes the stored value (None when NULL)
+def date_field(label: str, current="today"):
+    return st.date_input(label, current)
+
+def count_field(label: str, current=0) -> int:
+    return int(st.number_input(label, min_value=0, value=0 if current is None else int(current), step=1))
+
+def crud_ui(spec: EntitySpec, *fetch_args):
+    entity, label = spec.entity, spec.label
+
+    # Flash messages
+    render_flashes(entity, spec.id_field, spec.name_field)
+
+    df = spec.fetch(*fetch_args)
+    # Labels and the update form's (name, extra) lookup come straight off the column arrays (iterrows would build
+    # a Series per row). A failed fetch is an empty frame with no columns, hence the guard.
+    choices, rows = {}, {}
+    if not df.empty:
+        ids = tuple(df[spec.id_field].to_numpy(dtype=np.int64).tolist())
+        names = tuple(df[spec.name_field].to_numpy())
+        choices = format_choices(ids, names)
+        rows = dict(zip(ids, zip(names, df[spec.extra_field].to_numpy())))
+    id_options = list(choices)  # shared by the update and delete selectboxes
+    st.dataframe(df, use_container_width=True)
+
+    # INSERT
+    st.markdown(f"### ➕ Insert {label}")
+    with st.form(f"insert_{entity}_form", clear_on_submit=False):
+        c1, c2 = st.columns(2)
+        with c1:
+            name = st.text_input(f"{label} Name*", placeholder=spec.name_placeholder)
+        with c2:
+            extra = spec.extra_input(spec.extra_label)
+        if st.form_submit_button(f"Insert {label}"):
+            if not name.strip():
+                st.warning(f"{label} name is required.")
+            else:
+                rec = spec.insert(name.strip(), extra)
+                if rec:
+                    st.session_state.just_inserted = (entity, rec)
+                    rerun_tab()
+
+    if spec.after_insert:
+        spec.after_insert()
+
+    # UPDATE
+    st.markdown(f"### ✏️ Update {label}")
+    if df.empty:
+        st.caption(f"No {entity}s to update.")
+    else:
+        sel_id = st.selectbox(label, options=id_options, format_func=lambda k: choices[k], key=f"upd_{entity}_sel")
+        cur_name, cur_extra = rows[sel_id]
+        # Arrow-backed frames hand back pd.NA for NULLs, which st.date_input / int() can't take.
+        # None gives the same empty field the form showed before the Arrow switch.
+        if pd.isna(cur_extra):
+            cur_extra = None
+
+        with st.form(f"update_{entity}_form", clear_on_submit=False):
+            c1, c2 = st.columns(2)
+            with c1:
+                new_name = st.text_input(f"{label} Name", cur_name)
+            with c2:
+                new_extra = spec.extra_input(spec.extra_label, cur_extra)
+            if st.form_submit_button(f"Update {label}"):
+                rec = spec.update(sel_id, new_name.strip(), new_extra)
+                if rec:
+                    st.session_state.just_updated = (entity, rec)
+                    rerun_tab()
+
+    # DELETE
+    st.markdown(f"### 🗑️ Delete {label}")
+    if df.empty:
+        st.caption(f"No {entity}s to delete.")
+    else:
+        colA, colB = st.columns([3, 2])
+        with colA:
+            del_id = st.selectbox(f"Select {entity}", options=id_options,
+                                  format_func=lambda k: choices[k], key=f"del_{entity}_sel")
+        with colB:
+            confirm = st.checkbox("Confirm deletion", key=f"del_{entity}_confirm")
+
+        if st.button(f"Delete {label}"):
+            if not confirm:
+                st.warning("Please confirm before deleting.")
+            else:
+                rec = spec.delete(int(del_id))
+                if rec:
+                    st.session_state.just_deleted = (entity, rec)
+                    rerun_tab()
+
+def bulk_insert_songs_form():
+    st.markdown("### 📥 Bulk Insert Songs")
+    bulk = st.session_state.get("just_bulk_inserted")
+    if bulk:
+        recs, skipped = bulk
+        st.success(f"✅ Inserted {len(recs)} songs (IDs {recs[0]['song_id']}–{recs[-1]['song_id']})")
+        if skipped:
+            st.warning(f"Skipped {skipped} row(s) with a missing name or unreadable date.")
+        st.session_state.just_bulk_inserted = None
+
+    with st.form("bulk_insert_song_form", clear_on_submit=True):
+        upload = st.file_uploader("CSV with song_name and day_released columns", type="csv")
+        if st.form_submit_button("Bulk Insert"):
+            if upload is None:
+                st.warning("Choose a CSV file first.")
+            else:
+                # Read everything as text with no NA guessing, so a song literally titled "nan" or "NA" stays a title
+                csv = pd.read_csv(upload, dtype=str, keep_default_na=False)
+                missing = {"song_name", "day_released"} - set(csv.columns)
+                if missing:
+                    st.warning(f"CSV is missing column(s): {', '.join(sorted(missing))}")
+                else:
+                    csv["song_name"] = csv["song_name"].str.strip()
+                    csv["day_released"] = pd.to_datetime(csv["day_released"], errors="coerce").dt.date
+                    bad = csv["song_name"].eq("") | csv["day_released"].isna()
+                    skipped = int(bad.sum())
+                    if skipped and bad.all():
+                        st.warning(f"Nothing to insert: all {skipped} row(s) have a missing name or unreadable date.")
+                    rows = [
+                        {"songname": n, "dayreleased": d}
+                        for n, d in zip(csv.loc[~bad, "song_name"], csv.loc[~bad, "day_released"])
+                    ]
+                    try:
+                        recs = bulk_insert_songs(rows)
+                    except Exception as e:
+                        st.error(f"DB error: {e}")
+                        recs = []
+                    if recs:
+                        # The skipped count rides along with the flash, since the rerun would wipe a warning drawn here
+                        st.session_state.just_bulk_inserted = (recs, skipped)
+                        rerun_tab()
+
+SONG_SPEC = EntitySpec(
+    entity="song", label="Song",
+    fetch=fetch_songs, insert=insert_song, update=update_song, delete=delete_song,
+    id_field="song_id", name_field="song_name", name_placeholder="Anti-Hero",
+    extra_label="Release Date", extra_field="day_released", extra_input=date_field,
+    after_insert=bulk_insert_songs_form,
+)
+
+PLAYLIST_SPEC = EntitySpec(
+    entity="playlist", label="Playlist",
+    fetch=fetch_playlists, insert=insert_playlist, update=update_playlist, delete=delete_playlist,
+    id_field="playlist_id", name_field="playlist_name", name_placeholder="My Favorites",
+    extra_label="Number of Songs", extra_field="num_songs", extra_input=count_field,
+)
 
 # --- Sidebar ---
 with st.sidebar:
@@ -170,21 +337,22 @@ with st.sidebar:
 tab1, tab2, tab3, tab4, tab5 = st.tabs(["👤 Users", "🎤 Artists", "🎵 Songs", "💿 Albums", "📋 Playlists"])
 
 # TAB 1: USERS CRUD
-with tab1:
+# Each tab is a fragment, so its widgets and forms only rerun that tab. The post-write st.rerun calls are
+# fragment-scoped too, so showing the flash message doesn't rerun (and re-fetch) the other four tabs.
+@st.fragment
+def users_tab():
     st.subheader("👤 Users")
 
     # Flash messages
-    for key, icon, msg in [
-        ("just_inserted", "✅", "Inserted"),
-        ("just_updated", "✏️", "Updated"),
-        ("just_deleted", "🗑️", "Deleted")
-    ]:
-        if st.session_state.get(key):
-            rec = st.session_state[key]
-            st.success(f"{icon} {msg} user: {rec.get('username', rec.get('userName', 'N/A'))} (ID {rec.get('userid', rec.get('userID', 'N/A'))})")
-            st.session_state[key] = None
+    render_flashes("user", "user_id", "user_name")
 
     users = fetch_users()
+    users_by_id = users.set_index("user_id").to_dict("index") if not users.empty else {}
+    user_choices = {}
+    if not users.empty:
+        ids = tuple(users["user_id"].to_numpy(dtype=np.int64).tolist())
+        user_choices = format_choices(ids, tuple(users["user_name"].to_numpy()))
+    user_ids = list(user_choices)
     st.dataframe(users, use_container_width=True)
 
     # INSERT
@@ -197,25 +365,24 @@ with tab1:
             else:
                 rec = insert_user(username.strip())
                 if rec:
-                    st.session_state.just_inserted = rec
-                    st.rerun()
+                    st.session_state.just_inserted = ("user", rec)
+                    rerun_tab()
 
     # UPDATE
     st.markdown("### ✏️ Update User")
     if users.empty:
         st.caption("No users to update.")
     else:
-        user_choices = {int(r.userid): f"{int(r.userid)} — {r['username']}" for _, r in users.iterrows()}
-        sel_uid = st.selectbox("User", options=list(user_choices.keys()), format_func=lambda k: user_choices[k], key="upd_user_sel")
-        current = users[users["userid"] == sel_uid].iloc[0]
+        sel_uid = st.selectbox("User", options=user_ids, format_func=lambda k: user_choices[k], key="upd_user_sel")
+        current = users_by_id[sel_uid]
 
         with st.form("update_user_form", clear_on_submit=False):
-            new_username = st.text_input("Username", current["username"])
+            new_username = st.text_input("Username", current["user_name"])
             if st.form_submit_button("Update User"):
                 rec = update_user(sel_uid, new_username.strip())
                 if rec:
-                    st.session_state.just_updated = rec
-                    st.rerun()
+                    st.session_state.just_updated = ("user", rec)
+                    rerun_tab()
 
     # DELETE
     st.markdown("### 🗑️ Delete User")
@@ -224,7 +391,7 @@ with tab1:
     else:
         colA, colB = st.columns([3, 2])
         with colA:
-            del_uid = st.selectbox("Select user", options=list(user_choices.keys()),
+            del_uid = st.selectbox("Select user", options=user_ids,
                                   format_func=lambda k: user_choices[k], key="del_user_sel")
         with colB:
             confirm = st.checkbox("Confirm deletion", key="del_user_confirm")
@@ -235,25 +402,27 @@ with tab1:
             else:
                 rec = delete_user(int(del_uid))
                 if rec:
-                    st.session_state.just_deleted = rec
-                    st.rerun()
+                    st.session_state.just_deleted = ("user", rec)
+                    rerun_tab()
+
+with tab1:
+    users_tab()
 
 # TAB 2: ARTISTS CRUD
-with tab2:
+@st.fragment
+def artists_tab():
     st.subheader("🎤 Artists")
 
     # Flash messages
-    for key, icon, msg in [
-        ("just_inserted", "✅", "Inserted"),
-        ("just_updated", "✏️", "Updated"),
-        ("just_deleted", "🗑️", "Deleted")
-    ]:
-        if st.session_state.get(key):
-            rec = st.session_state[key]
-            st.success(f"{icon} {msg} artist: {rec.get('artist_name', 'N/A')} (ID {rec.get('artistid', 'N/A')})")
-            st.session_state[key] = None
+    render_flashes("artist", "artist_id", "artist_name")
 
     artists = fetch_artists()
+    artists_by_id = artists.set_index("artist_id").to_dict("index") if not artists.empty else {}
+    artist_choices = {}
+    if not artists.empty:
+        ids = tuple(artists["artist_id"].to_numpy(dtype=np.int64).tolist())
+        artist_choices = format_choices(ids, tuple(artists["artist_name"].to_numpy()))
+    artist_ids = list(artist_choices)
     st.dataframe(artists, use_container_width=True)
 
     # INSERT
@@ -270,29 +439,29 @@ with tab2:
             else:
                 rec = insert_artist(artist_name.strip(), artist_location.strip() or None)
                 if rec:
-                    st.session_state.just_inserted = rec
-                    st.rerun()
+                    st.session_state.just_inserted = ("artist", rec)
+                    rerun_tab()
 
     # UPDATE
     st.markdown("### ✏️ Update Artist")
     if artists.empty:
         st.caption("No artists to update.")
     else:
-        artist_choices = {int(r.artistid): f"{int(r.artistid)} — {r['artist_name']}" for _, r in artists.iterrows()}
-        sel_aid = st.selectbox("Artist", options=list(artist_choices.keys()), format_func=lambda k: artist_choices[k], key="upd_artist_sel")
-        current = artists[artists["artistid"] == sel_aid].iloc[0]
+        sel_aid = st.selectbox("Artist", options=artist_ids, format_func=lambda k: artist_choices[k], key="upd_artist_sel")
+        current = artists_by_id[sel_aid]
 
         with st.form("update_artist_form", clear_on_submit=False):
             c1, c2 = st.columns(2)
             with c1:
                 new_name = st.text_input("Artist Name", current["artist_name"])
             with c2:
-                new_location = st.text_input("Location", current["artist_location"] or "")
+                location = current["artist_location"]
+                new_location = st.text_input("Location", "" if pd.isna(location) else location)
             if st.form_submit_button("Update Artist"):
                 rec = update_artist(sel_aid, new_name.strip(), new_location.strip() or None)
                 if rec:
-                    st.session_state.just_updated = rec
-                    st.rerun()
+                    st.session_state.just_updated = ("artist", rec)
+                    rerun_tab()
 
     # DELETE
     st.markdown("### 🗑️ Delete Artist")
@@ -301,7 +470,7 @@ with tab2:
     else:
         colA, colB = st.columns([3, 2])
         with colA:
-            del_aid = st.selectbox("Select artist", options=list(artist_choices.keys()),
+            del_aid = st.selectbox("Select artist", options=artist_ids,
                                   format_func=lambda k: artist_choices[k], key="del_artist_sel")
         with colB:
             confirm = st.checkbox("Confirm deletion", key="del_artist_confirm")
@@ -312,167 +481,39 @@ with tab2:
             else:
                 rec = delete_artist(int(del_aid))
                 if rec:
-                    st.session_state.just_deleted = rec
-                    st.rerun()
+                    st.session_state.just_deleted = ("artist", rec)
+                    rerun_tab()
+
+with tab2:
+    artists_tab()
 
 # TAB 3: SONGS CRUD
-with tab3:
+@st.fragment
+def songs_tab(limit: int):
     st.subheader("🎵 Songs")
+    crud_ui(SONG_SPEC, limit)
 
-    # Flash messages
-    for key, icon, msg in [
-        ("just_inserted", "✅", "Inserted"),
-        ("just_updated", "✏️", "Updated"),
-        ("just_deleted", "🗑️", "Deleted")
-    ]:
-        if st.session_state.get(key):
-            rec = st.session_state[key]
-            st.success(f"{icon} {msg} song: {rec.get('songname', rec.get('songName', 'N/A'))} (ID {rec.get('song_id', 'N/A')})")
-            st.session_state[key] = None
-
-    songs = fetch_songs(int(row_limit))
-    st.dataframe(songs, use_container_width=True)
-
-    # INSERT
-    st.markdown("### ➕ Insert Song")
-    with st.form("insert_song_form", clear_on_submit=False):
-        c1, c2 = st.columns(2)
-        with c1:
-            song_name = st.text_input("Song Name*", placeholder="Anti-Hero")
-        with c2:
-            date_released = st.date_input("Release Date")
-        if st.form_submit_button("Insert Song"):
-            if not song_name.strip():
-                st.warning("Song name is required.")
-            else:
-                rec = insert_song(song_name.strip(), date_released)
-                if rec:
-                    st.session_state.just_inserted = rec
-                    st.rerun()
-
-    # UPDATE
-    st.markdown("### ✏️ Update Song")
-    if songs.empty:
-        st.caption("No songs to update.")
-    else:
-        song_choices = {int(r.song_id): f"{int(r.song_id)} — {r['songname']}" for _, r in songs.iterrows()}
-        sel_sid = st.selectbox("Song", options=list(song_choices.keys()), format_func=lambda k: song_choices[k], key="upd_song_sel")
-        current = songs[songs["song_id"] == sel_sid].iloc[0]
-
-        with st.form("update_song_form", clear_on_submit=False):
-            c1, c2 = st.columns(2)
-            with c1:
-                new_song_name = st.text_input("Song Name", current["songname"])
-            with c2:
-                new_date = st.date_input("Release Date", pd.to_datetime(current["dayreleased"]))
-            if st.form_submit_button("Update Song"):
-                rec = update_song(sel_sid, new_song_name.strip(), new_date)
-                if rec:
-                    st.session_state.just_updated = rec
-                    st.rerun()
-
-    # DELETE
-    st.markdown("### 🗑️ Delete Song")
-    if songs.empty:
-        st.caption("No songs to delete.")
-    else:
-        colA, colB = st.columns([3, 2])
-        with colA:
-            del_sid = st.selectbox("Select song", options=list(song_choices.keys()),
-                                  format_func=lambda k: song_choices[k], key="del_song_sel")
-        with colB:
-            confirm = st.checkbox("Confirm deletion", key="del_song_confirm")
-
-        if st.button("Delete Song"):
-            if not confirm:
-                st.warning("Please confirm before deleting.")
-            else:
-                rec = delete_song(int(del_sid))
-                if rec:
-                    st.session_state.just_deleted = rec
-                    st.rerun()
+with tab3:
+    songs_tab(row_limit)
 
 # TAB 4: ALBUMS (READ ONLY)
-with tab4:
+@st.fragment
+def albums_tab():
     st.subheader("💿 Albums")
+    if st.button("🔄 Refresh albums"):
+        fetch_albums.clear()
     albums = fetch_albums()
     st.dataframe(albums, use_container_width=True)
     st.info("💡 Album CRUD coming soon! For now, you can view albums here.")
 
+with tab4:
+    albums_tab()
 
 # TAB 5: PLAYLISTS CRUD
-with tab5:
+@st.fragment
+def playlists_tab():
     st.subheader("📋 Playlists")
+    crud_ui(PLAYLIST_SPEC)
 
-    # Flash messages
-    for key, icon, msg in [
-        ("just_inserted", "✅", "Inserted"),
-        ("just_updated", "✏️", "Updated"),
-        ("just_deleted", "🗑️", "Deleted")
-    ]:
-        if st.session_state.get(key):
-            rec = st.session_state[key]
-            st.success(f"{icon} {msg} playlist: {rec.get('playlist_name', 'N/A')} (ID {rec.get('playlistid', 'N/A')})")
-            st.session_state[key] = None
-
-    playlists = fetch_playlists()
-    st.dataframe(playlists, use_container_width=True)
-
-    # INSERT
-    st.markdown("### ➕ Insert Playlist")
-    with st.form("insert_playlist_form", clear_on_submit=False):
-        c1, c2 = st.columns(2)
-        with c1:
-            playlist_name = st.text_input("Playlist Name*", placeholder="My Favorites")
-        with c2:
-            num_songs = st.number_input("Number of Songs", min_value=0, value=0, step=1)
-        if st.form_submit_button("Insert Playlist"):
-            if not playlist_name.strip():
-                st.warning("Playlist name is required.")
-            else:
-                rec = insert_playlist(playlist_name.strip(), int(num_songs))
-                if rec:
-                    st.session_state.just_inserted = rec
-                    st.rerun()
-
-    # UPDATE
-    st.markdown("### ✏️ Update Playlist")
-    if playlists.empty:
-        st.caption("No playlists to update.")
-    else:
-        playlist_choices = {int(r.playlistid): f"{int(r.playlistid)} — {r['playlist_name']}" for _, r in playlists.iterrows()}
-        sel_pid = st.selectbox("Playlist", options=list(playlist_choices.keys()), format_func=lambda k: playlist_choices[k], key="upd_playlist_sel")
-        current = playlists[playlists["playlistid"] == sel_pid].iloc[0]
-
-        with st.form("update_playlist_form", clear_on_submit=False):
-            c1, c2 = st.columns(2)
-            with c1:
-                new_playlist_name = st.text_input("Playlist Name", current["playlist_name"])
-            with c2:
-                new_num_songs = st.number_input("Number of Songs", min_value=0, value=int(current["num_songs"]), step=1)
-            if st.form_submit_button("Update Playlist"):
-                rec = update_playlist(sel_pid, new_playlist_name.strip(), int(new_num_songs))
-                if rec:
-                    st.session_state.just_updated = rec
-                    st.rerun()
-
-    # DELETE
-    st.markdown("### 🗑️ Delete Playlist")
-    if playlists.empty:
-        st.caption("No playlists to delete.")
-    else:
-        colA, colB = st.columns([3, 2])
-        with colA:
-            del_pid = st.selectbox("Select playlist", options=list(playlist_choices.keys()),
-                                  format_func=lambda k: playlist_choices[k], key="del_playlist_sel")
-        with colB:
-            confirm = st.checkbox("Confirm deletion", key="del_playlist_confirm")
-
-        if st.button("Delete Playlist"):
-            if not confirm:
-                st.warning("Please confirm before deleting.")
-            else:
-                rec = delete_playlist(int(del_pid))
-                if rec:
-                    st.session_state.just_deleted = rec
-                    st.rerun()
\ No newline at end of file
+with tab5:
+    playlists_tab()
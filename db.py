@@ -0,0 +1,160 @@
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import streamlit as st
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import TextClause
+
+# Shared database layer for app.py and app_full_crud.py: one cached engine (and pool) per app process, one set of fetch helpers.
+# Nothing here touches Streamlit at import time, so the apps can import it before st.set_page_config.
+
+load_dotenv()
+
+PGHOST = os.getenv("PGHOST", "localhost")
+PGPORT = os.getenv("PGPORT", "5432")
+PGDATABASE = os.getenv("PGDATABASE")
+PGUSER = os.getenv("PGUSER")
+PGPASSWORD = os.getenv("PGPASSWORD")
+PGSSLMODE = os.getenv("PGSSLMODE", "require")
+
+STREAM_CHUNK_ROWS = 500
+BULK_PAGE_ROWS = 500
+# Next to this file rather than the cwd, so `streamlit run /path/to/app.py` works from anywhere
+BOOTSTRAP_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "db_bootstrap.sql")
+
+log = logging.getLogger(__name__)
+
+def make_url() -> URL:
+    return URL.create(
+        "postgresql+psycopg",
+        username=PGUSER,
+        password=PGPASSWORD,
+        host=PGHOST,
+        port=int(PGPORT),
+        database=PGDATABASE,
+        query={
+            "connect_timeout": "5",
+            "sslmode": PGSSLMODE,
+            # Applied by Postgres during connection startup, so new pooled connections don't pay extra SET round-trips
+            "options": f"-c statement_timeout=8000 -c search_path={PGUSER},public",
+        },
+    )
+
+@st.cache_resource
+def get_engine() -> Engine:
+    if not all([PGDATABASE, PGUSER, PGPASSWORD]):
+        st.error("Missing DB credentials. Please set PGDATABASE, PGUSER, and PGPASSWORD in your .env file.")
+        st.stop()
+
+    return create_engine(
+        make_url(),
+        pool_pre_ping=True,
+        # Each `streamlit run` process (app.py, app_full_crud.py) gets its own pool. The most one session
+        # checks out at once is fetch_many's 4 workers, so 5 steady + 5 overflow covers that plus a second session
+        pool_size=5,
+        max_overflow=5,
+        pool_timeout=5,
+        # Hand idle connections back well before managed Postgres hosts start dropping them
+        pool_recycle=300,
+        # psycopg 3 switches a statement to a server-side prepared statement after it has run this many times
+        connect_args={"prepare_threshold": 5},
+    )
+
+# Creates the JOIN indexes from db_bootstrap.sql once per server process. Best effort: if the script is missing
+# or the DB user isn't allowed to create indexes the app still works, just without them (the reason gets logged,
+# since the False result is cached for the life of the process).
+@st.cache_resource(show_spinner=False)
+def ensure_indexes(path: str = BOOTSTRAP_SQL) -> bool:
+    try:
+        with open(path) as f:
+            script = "".join(line for line in f if not line.lstrip().startswith("--"))
+        with get_engine().begin() as conn:
+            for stmt in script.split(";"):
+                if stmt.strip():
+                    conn.exec_driver_sql(stmt)
+        return True
+    except Exception:
+        log.exception("Skipping index bootstrap from %s", path)
+        return False
+
+# Takes either a raw SQL string or one of the pre-built statements from queries.py.
+# Big LIMITs are read through a server-side cursor in STREAM_CHUNK_ROWS chunks so the whole result never sits
+# in memory twice; small ones skip it since the extra DECLARE/FETCH round-trips would cost more than they save.
+# Columns come back Arrow-backed: strings take a fraction of the memory of object dtype, and st.dataframe
+# already ships frames to the browser as Arrow so there's less converting to do.
+def fetch_df_uncached(sql: str | TextClause, params: dict | None = None) -> pd.DataFrame:
+    stmt = sql if isinstance(sql, TextClause) else text(sql)
+    params = params or {}
+    engine = get_engine()
+    if params.get("lim", 0) <= STREAM_CHUNK_ROWS:
+        with engine.connect() as conn:
+            return pd.read_sql(stmt, conn, params=params, dtype_backend="pyarrow")
+
+    with engine.connect().execution_options(stream_results=True) as conn:
+        chunks = list(pd.read_sql(stmt, conn, params=params, chunksize=STREAM_CHUNK_ROWS, dtype_backend="pyarrow"))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+# Every widget click reruns the whole script, so identical queries get served from memory for 5 minutes.
+# Params come in as sorted (name, value) pairs so the cache key doesn't depend on dict order,
+# and statements are keyed on their SQL text.
+@st.cache_data(ttl=300, show_spinner=False, hash_funcs={TextClause: str})
+def fetch_df_cached(sql: str | TextClause, params: tuple = ()) -> pd.DataFrame:
+    return fetch_df_uncached(sql, dict(params))
+
+def _params_key(params: dict | None) -> tuple:
+    return tuple(sorted((params or {}).items()))
+
+def fetch_df(sql: str | TextClause, params: dict | None = None) -> pd.DataFrame:
+    try:
+        return fetch_df_cached(sql, _params_key(params))
+    except Exception as e:
+        st.error(f"DB error: {e}")
+        return pd.DataFrame()
+
+# Runs independent queries at the same time (each worker checks out its own pooled connection),
+# so the caller waits for the slowest query instead of all of them back to back.
+def fetch_many(stmts: dict[str, tuple[str | TextClause, dict | None]]) -> dict[str, pd.DataFrame]:
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = {
+            name: pool.submit(fetch_df_cached, sql, _params_key(params))
+            for name, (sql, params) in stmts.items()
+        }
+
+    # st.error has to be called from the script thread, so errors are surfaced here rather than in the workers
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result()
+        except Exception as e:
+            st.error(f"DB error: {e}")
+            results[name] = pd.DataFrame()
+    return results
+
+# "id — name" selectbox labels for the CRUD tabs. It lives here rather than in app_full_crud.py because Streamlit
+# re-executes the app script on every rerun, so a cache defined there starts empty each time; this module is
+# imported once per process. The fetches are cached, so reruns pass in equal tuples and get the built dict back.
+# Callers must not mutate the result.
+@functools.lru_cache(maxsize=8)
+def format_choices(ids: tuple, names: tuple) -> dict[int, str]:
+    return {i: f"{i} — {n}" for i, n in zip(ids, names)}
+
+# Writes only ever hand back the one RETURNING row, so skip pandas and return it as a plain dict
+def execute_returning(stmt: TextClause, params: dict) -> dict | None:
+    with get_engine().begin() as conn:
+        row = conn.execute(stmt, params).mappings().first()
+    return dict(row) if row else None
+
+# Same idea for multi-row writes: the list of param dicts is sent BULK_PAGE_ROWS rows per statement,
+# so N rows cost ceil(N / BULK_PAGE_ROWS) round-trips, and every RETURNING row comes back as a dict
+def execute_many_returning(stmt: Executable, rows: list[dict]) -> list[dict]:
+    if not rows:
+        return []
+    with get_engine().begin() as conn:
+        result = conn.execute(stmt.execution_options(insertmanyvalues_page_size=BULK_PAGE_ROWS), rows)
+        return [dict(r) for r in result.mappings()]
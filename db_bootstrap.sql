@@ -0,0 +1,25 @@
+-- Indexes for the JOIN columns the Audioplane apps hit on every page load.
+-- Safe to run more than once (IF NOT EXISTS). app.py applies this file once per server process.
+
+-- Song -> Produces -> Artist (Songs tab, relationship views, network graph)
+CREATE INDEX IF NOT EXISTS ix_produces_song ON Produces(song_id) INCLUDE (artistID);
+-- Artist song counts (LEFT JOIN from Artist)
+CREATE INDEX IF NOT EXISTS ix_produces_artist ON Produces(artistID);
+
+-- Most liked songs / top 5 pie chart (GROUP BY song_id)
+CREATE INDEX IF NOT EXISTS ix_likes_song_user ON Likes(song_id, userID);
+-- User activity (LEFT JOIN from User_table)
+CREATE INDEX IF NOT EXISTS ix_likes_user ON Likes(userID);
+
+-- Playlist contents (WHERE playlistID = :pid ORDER BY position)
+CREATE INDEX IF NOT EXISTS ix_saves_playlist_pos ON Saves(playlistID, position) INCLUDE (song_id);
+
+-- Album -> Records -> Artist
+CREATE INDEX IF NOT EXISTS ix_records_album ON Records(albumID) INCLUDE (artistID);
+
+-- Album tracks (ORDER BY album, track_number)
+CREATE INDEX IF NOT EXISTS ix_contains_album_track ON Contains(albumID, track_number) INCLUDE (song_id);
+
+-- Playlist creators / user activity
+CREATE INDEX IF NOT EXISTS ix_creates_playlist ON Creates(playlistID) INCLUDE (userID);
+CREATE INDEX IF NOT EXISTS ix_creates_user ON Creates(userID);
@@ -0,0 +1,198 @@
+from sqlalchemy import Column, Date, Integer, MetaData, Table, Text, bindparam, insert, text
+
+# Every SQL statement the two Streamlit apps run, pre-built as text() objects.
+# Streamlit re-executes app.py / app_full_crud.py top to bottom on every widget interaction, so anything
+# defined in those scripts gets rebuilt each rerun. This module is only imported once per process,
+# so each statement is parsed (bind params and all) exactly once.
+
+# :lim is declared as an Integer bind so callers can pass the number_input value straight through
+LIM = bindparam("lim", type_=Integer)
+
+# ==================== app.py (read-only viewer) ====================
+
+# The "all rows" queries carry COUNT(*) OVER () so the real table size comes back with the page of rows
+USERS_PAGE = text("SELECT *, COUNT(*) OVER () AS total_count FROM User_table ORDER BY userID LIMIT :lim").bindparams(LIM)
+
+SONGS_PAGE = text("SELECT *, COUNT(*) OVER () AS total_count FROM Song ORDER BY song_id LIMIT :lim").bindparams(LIM)
+
+# Songs along with the artist who created them
+SONGS_WITH_ARTIST = text("""
+    SELECT s.song_id, s.songName, s.dayReleased, a.artist_name
+    FROM Song s
+    JOIN Produces p ON s.song_id = p.song_id
+    JOIN Artist a ON p.artistID = a.artistID
+    ORDER BY s.song_id
+    LIMIT :lim
+""").bindparams(LIM)
+
+ALBUMS_PAGE = text("SELECT *, COUNT(*) OVER () AS total_count FROM Album ORDER BY albumID LIMIT :lim").bindparams(LIM)
+
+ALBUMS_WITH_ARTIST = text("""
+    SELECT al.albumID, al.album_name, al.release_date, ar.artist_name
+    FROM Album al
+    JOIN Records r ON al.albumID = r.albumID
+    JOIN Artist ar ON r.artistID = ar.artistID
+    ORDER BY al.release_date DESC
+    LIMIT :lim
+""").bindparams(LIM)
+
+ARTISTS_PAGE = text("SELECT *, COUNT(*) OVER () AS total_count FROM Artist ORDER BY artistID LIMIT :lim").bindparams(LIM)
+
+ARTIST_SONG_COUNTS = text("""
+    SELECT a.artist_name, COUNT(p.song_id) as song_count
+    FROM Artist a
+    LEFT JOIN Produces p ON a.artistID = p.artistID
+    GROUP BY a.artistID, a.artist_name
+    ORDER BY song_count DESC
+    LIMIT :lim
+""").bindparams(LIM)
+
+PLAYLISTS_PAGE = text("SELECT *, COUNT(*) OVER () AS total_count FROM Playlist ORDER BY playlistID LIMIT :lim").bindparams(LIM)
+
+PLAYLISTS_WITH_CREATOR = text("""
+    SELECT p.playlistID, p.playlist_name, p.num_songs, u.userName as creator
+    FROM Playlist p
+    JOIN Creates c ON p.playlistID = c.playlistID
+    JOIN User_table u ON c.userID = u.userID
+    ORDER BY p.playlistID
+    LIMIT :lim
+""").bindparams(LIM)
+
+PLAYLIST_NAMES = text("SELECT playlistID, playlist_name FROM Playlist ORDER BY playlistID")
+
+PLAYLIST_SONGS = text("""
+    SELECT s.songName, a.artist_name, sv.position
+    FROM Saves sv
+    JOIN Song s ON sv.song_id = s.song_id
+    JOIN Produces p ON s.song_id = p.song_id
+    JOIN Artist a ON p.artistID = a.artistID
+    WHERE sv.playlistID = :pid
+    ORDER BY sv.position
+""")
+
+# --- Relationship views ---
+USER_LIKES = text("""
+    SELECT u.userName, s.songName, a.artist_name, l.liked_date
+    FROM Likes l
+    JOIN User_table u ON l.userID = u.userID
+    JOIN Song s ON l.song_id = s.song_id
+    JOIN Produces p ON s.song_id = p.song_id
+    JOIN Artist a ON p.artistID = a.artistID
+    ORDER BY l.liked_date DESC
+    LIMIT :lim
+""").bindparams(LIM)
+
+ALBUM_TRACKS = text("""
+    SELECT al.album_name, s.songName, c.track_number, ar.artist_name
+    FROM Contains c
+    JOIN Album al ON c.albumID = al.albumID
+    JOIN Song s ON c.song_id = s.song_id
+    JOIN Records r ON al.albumID = r.albumID
+    JOIN Artist ar ON r.artistID = ar.artistID
+    ORDER BY al.album_name, c.track_number
+    LIMIT :lim
+""").bindparams(LIM)
+
+MOST_LIKED_SONGS = text("""
+    SELECT s.songName, a.artist_name, COUNT(l.userID) as like_count
+    FROM Song s
+    JOIN Produces p ON s.song_id = p.song_id
+    JOIN Artist a ON p.artistID = a.artistID
+    LEFT JOIN Likes l ON s.song_id = l.song_id
+    GROUP BY s.song_id, s.songName, a.artist_name
+    ORDER BY like_count DESC
+    LIMIT :lim
+""").bindparams(LIM)
+
+USER_ACTIVITY = text("""
+    SELECT
+        u.userName,
+        COUNT(DISTINCT l.song_id) as songs_liked,
+        COUNT(DISTINCT c.playlistID) as playlists_created
+    FROM User_table u
+    LEFT JOIN Likes l ON u.userID = l.userID
+    LEFT JOIN Creates c ON u.userID = c.userID
+    GROUP BY u.userID, u.userName
+    ORDER BY songs_liked DESC
+    LIMIT :lim
+""").bindparams(LIM)
+
+# --- Visualizations ---
+NETWORK_EDGES = text("""
+    SELECT u.userName, s.songName, a.artist_name
+    FROM Likes l
+    JOIN User_table u ON l.userID = u.userID
+    JOIN Song s ON l.song_id = s.song_id
+    JOIN Produces p ON s.song_id = p.song_id
+    JOIN Artist a ON p.artistID = a.artistID
+    LIMIT 500
+""")
+
+# Count likes first and only join the top 5 back to Song, so the GROUP BY never touches songs nobody liked
+TOP_LIKED_SONGS = text("""
+    SELECT s.songName, t.like_count
+    FROM (
+        SELECT song_id, COUNT(*) AS like_count
+        FROM Likes
+        GROUP BY song_id
+        ORDER BY like_count DESC
+        LIMIT 5
+    ) t
+    JOIN Song s USING (song_id)
+    ORDER BY t.like_count DESC
+""")
+
+AVG_SONGS_PER_PLAYLIST = text("""
+    SELECT AVG(song_count) AS avg_songs
+    FROM (
+        SELECT playlistID, COUNT(song_id) AS song_count
+        FROM Saves
+        GROUP BY playlistID
+    ) t
+""")
+
+# ==================== app_full_crud.py ====================
+# Postgres folds unquoted identifiers to lowercase (userID -> userid), so every column the CRUD app reads back
+# is aliased to an explicit snake_case name. The Python side can then index rows directly (rec["user_id"]).
+
+CRUD_USERS = text("SELECT userID AS user_id, userName AS user_name FROM User_table ORDER BY userID")
+CRUD_ARTISTS = text("SELECT artistID AS artist_id, artist_name, artist_location FROM Artist ORDER BY artistID")
+CRUD_ALBUMS = text("SELECT albumID AS album_id, album_name, release_date FROM Album ORDER BY albumID")
+CRUD_SONGS = text("SELECT song_id, songName AS song_name, dayReleased AS day_released FROM Song ORDER BY song_id LIMIT :lim").bindparams(LIM)
+CRUD_PLAYLISTS = text("SELECT playlistID AS playlist_id, playlist_name, num_songs FROM Playlist ORDER BY playlistID")
+
+# --- SONG CRUD ---
+INSERT_SONG = text("INSERT INTO Song(songName, dayReleased) VALUES (:n, :d) RETURNING song_id, songName AS song_name, dayReleased AS day_released")
+UPDATE_SONG = text("UPDATE Song SET songName = :n, dayReleased = :d WHERE song_id = :sid RETURNING song_id, songName AS song_name, dayReleased AS day_released")
+DELETE_SONG = text("DELETE FROM Song WHERE song_id = :sid RETURNING song_id, songName AS song_name, dayReleased AS day_released")
+
+# Bulk version for CSV uploads. It's a Core insert() rather than text() so that executing it with a list of rows
+# gets batched into multi-row INSERT ... VALUES (...), (...) statements (SQLAlchemy "insertmanyvalues")
+# instead of one round-trip per row. Rows are dicts keyed on songname / dayreleased.
+# It has to be a real Table with song_id as the primary key: returning(sort_by_parameter_order=True) needs that
+# to line the batched RETURNING rows back up with the input order (a bare table() clause errors on 2+ rows).
+_song = Table(
+    "song", MetaData(),
+    Column("song_id", Integer, primary_key=True),
+    Column("songname", Text),
+    Column("dayreleased", Date),
+)
+BULK_INSERT_SONGS = insert(_song).returning(
+    _song.c.song_id, _song.c.songname.label("song_name"), _song.c.dayreleased.label("day_released"),
+    sort_by_parameter_order=True,
+)
+
+# --- ARTIST CRUD ---
+INSERT_ARTIST = text("INSERT INTO Artist(artist_name, artist_location) VALUES (:n, :l) RETURNING artistID AS artist_id, artist_name, artist_location")
+UPDATE_ARTIST = text("UPDATE Artist SET artist_name = :n, artist_location = :l WHERE artistID = :aid RETURNING artistID AS artist_id, artist_name, artist_location")
+DELETE_ARTIST = text("DELETE FROM Artist WHERE artistID = :aid RETURNING artistID AS artist_id, artist_name, artist_location")
+
+# --- USER CRUD ---
+INSERT_USER = text("INSERT INTO User_table(userName) VALUES (:n) RETURNING userID AS user_id, userName AS user_name")
+UPDATE_USER = text("UPDATE User_table SET userName = :n WHERE userID = :uid RETURNING userID AS user_id, userName AS user_name")
+DELETE_USER = text("DELETE FROM User_table WHERE userID = :uid RETURNING userID AS user_id, userName AS user_name")
+
+# --- PLAYLIST CRUD ---
+INSERT_PLAYLIST = text("INSERT INTO Playlist(playlist_name, num_songs) VALUES (:n, :ns) RETURNING playlistID AS playlist_id, playlist_name, num_songs")
+UPDATE_PLAYLIST = text("UPDATE Playlist SET playlist_name = :n, num_songs = :ns WHERE playlistID = :pid RETURNING playlistID AS playlist_id, playlist_name, num_songs")
+DELETE_PLAYLIST = text("DELETE FROM Playlist WHERE playlistID = :pid RETURNING playlistID AS playlist_id, playlist_name, num_songs")
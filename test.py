@@ -1,17 +1,36 @@
-import os, pandas as pd
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv
+import pandas as pd
+from sqlalchemy import text
 
-load_dotenv()
-PGHOST = os.getenv("PGHOST", "localhost")
-PGPORT = os.getenv("PGPORT", "5432")
-PGDATABASE = os.getenv("PGDATABASE")
-PGUSER = os.getenv("PGUSER")
-PGPASSWORD = os.getenv("PGPASSWORD")
+# Same pooled engine (and .env settings) the Streamlit apps use
+from db import PGUSER, get_engine, make_url
 
-DB_URL = f"postgresql+psycopg2://{PGUSER}:{PGPASSWORD}@{PGHOST}:{PGPORT}/{PGDATABASE}"
-engine = create_engine(DB_URL, pool_pre_ping=True)
+# connectorx reads straight into Arrow buffers in Rust, skipping the per-row Python DBAPI path.
+# It's optional: without it this falls back to pd.read_sql through the shared engine.
+try:
+    import connectorx as cx
+except ImportError:
+    cx = None
 
-with engine.connect() as conn:
-    df = pd.read_sql(text("select tablename, schemaname from pg_catalog.pg_tables limit 10"), conn)
-print(df.head())
\ No newline at end of file
+# The statement_timeout / search_path startup options from db.make_url have to show up on a fresh connection
+with get_engine().connect() as conn:
+    timeout = conn.exec_driver_sql("SHOW statement_timeout").scalar()
+    search_path = conn.exec_driver_sql("SHOW search_path").scalar()
+assert timeout == "8s", f"statement_timeout is {timeout!r}, expected '8s'"
+# Set through the startup option the raw "user,public" string is kept as-is, so compare the parsed list
+assert [p.strip() for p in search_path.split(",")] == [PGUSER, "public"], f"search_path is {search_path!r}"
+print(f"statement_timeout={timeout} search_path={search_path}")
+
+SQL = "select tablename, schemaname from pg_catalog.pg_tables limit 10"
+
+if cx is not None:
+    # connectorx opens its own connection from a plain postgresql:// URL (no SQLAlchemy driver suffix).
+    # render_as_string encodes the spaces in `options` as "+", which the Rust driver doesn't decode, so that
+    # one is left off; the startup options are already checked through the shared engine above.
+    url = make_url()
+    cx_url = url.set(drivername="postgresql", query={k: v for k, v in url.query.items() if k != "options"})
+    table = cx.read_sql(cx_url.render_as_string(hide_password=False), SQL, return_type="arrow")
+    df = table.to_pandas(types_mapper=pd.ArrowDtype)
+else:
+    with get_engine().connect() as conn:
+        df = pd.read_sql(text(SQL), conn, dtype_backend="pyarrow")
+print(df.head())
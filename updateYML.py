@@ -1,8 +1,14 @@
 import yaml
 
+# Use libyaml's C parser/emitter when PyYAML was built with it, otherwise the pure Python ones (same output)
+if yaml.__with_libyaml__:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+else:
+    from yaml import SafeDumper, SafeLoader
+
 # Load the YAML file
 with open('enivonment.yml', 'r') as file:
-    config_data = yaml.safe_load(file)
+    config_data = yaml.load(file, Loader=SafeLoader)
 
 # Modify the data
 config_data['setting_name'] = 'new_value'
@@ -10,4 +16,4 @@ config_data['another_list'].append('new_item')
 
 # Save the modified data back to the YAML file
 with open('config.yaml', 'w') as file:
-    yaml.dump(config_data, file, default_flow_style=False)
\ No newline at end of file
+    yaml.dump(config_data, file, Dumper=SafeDumper, default_flow_style=False)